@@ -1,47 +1,495 @@
-from typing import Any, Dict, List, Tuple
+from collections import deque
+from collections.abc import MutableMapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial, wraps
+from keyword import iskeyword
+from operator import attrgetter
+from types import MemberDescriptorType, NoneType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 import logging
+import sys
+
+from text_kernels import normalize_text, normalize_texts
 
 logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------------
+# Execution memoization
+# ------------------------------------------------------------------
+# Hash of objects that do not define their own, derived from their identity
+_IDENTITY_HASH: Any = object.__hash__
+
+# Whether each combination of input types, as seen by @memoize, is hashed by
+# value (no type among them hashes its instances by identity)
+_hashed_by_value: Dict[Tuple[type, ...], bool] = {}
+
+# Most values, counting nested ones, that the unhashable inputs of a call may
+# hold to be memoized by a frozen copy; larger inputs always re-execute
+FREEZE_LIMIT = 64
+
+
+def _freeze(value: Any, budget: List[int]) -> Any:
+    """
+    Returns a hashable copy of a value made of lists, tuples, dicts, sets and
+    values hashed by value, each container tagged with its type so that a list
+    and a tuple of the same items differ. Raises a TypeError for any other
+    value, or as soon as the containers' items outnumber budget[0] in all.
+    """
+    t = type(value)
+    if t is list or t is tuple or t is dict or t is set or t is frozenset:
+        # Charged before recursing, so large inputs are rejected at once
+        budget[0] -= len(value)
+        if budget[0] < 0:
+            raise TypeError("Value is too large to freeze.")
+    if t is list or t is tuple:
+        return (t, tuple([_freeze(item, budget) for item in value]))
+    if t is dict:
+        return (
+            t,
+            frozenset(
+                [(_freeze(k, budget), _freeze(v, budget)) for k, v in value.items()]
+            ),
+        )
+    if t is set or t is frozenset:
+        return (t, frozenset([_freeze(item, budget) for item in value]))
+    if t.__hash__ is _IDENTITY_HASH and t is not NoneType:
+        raise TypeError(f"{t.__name__!r} objects are hashed by identity.")
+    hash(value)
+    return value
+
+
+def memoize(execute: Callable[..., None]) -> Callable[..., None]:
+    """
+    Decorator for BaseComponent.execute overrides that skips execution when the
+    component's inputs are unchanged since the previous call and restores the
+    outputs produced by that call instead. Inputs are compared by type and
+    value, so equal values of different types (1, 1.0, True) are not mixed up.
+    Unhashable inputs built from lists, dicts and sets are compared by a frozen
+    copy as long as they hold at most FREEZE_LIMIT values in all. Other
+    unhashable values and objects hashed by identity may be mutated in place
+    without it being noticed, so components given them always re-execute.
+    Values nested in containers are compared by equality alone. Outputs that
+    passed an input through are restored from the current input rather than
+    the previous call's object.
+    """
+
+    @wraps(execute)
+    def wrapper(self: "BaseComponent") -> None:
+        inputs = self._inputs
+        values = inputs.snapshot()
+        if len(inputs._keys) == 1:
+            values = (values,)
+        types = tuple(map(type, values))
+        key: Any
+        try:
+            hash(values)
+        except TypeError:
+            try:
+                # The third item keeps frozen keys apart from (types, values) keys
+                key = (types, _freeze(values, [FREEZE_LIMIT]), None)
+            except TypeError:
+                key = None
+        else:
+            by_value = _hashed_by_value.get(types)
+            if by_value is None:
+                # Objects hashed by identity may have been mutated since the last call
+                by_value = _hashed_by_value[types] = not any(
+                    t.__hash__ is _IDENTITY_HASH and t is not NoneType for t in types
+                )
+            key = (types, values) if by_value else None
+
+        if key is not None and key == self._last_inputs_key:
+            outputs, passed_through = self._last_outputs
+            self._outputs.restore(outputs)
+            for output_key, i in passed_through:
+                setattr(self, output_key, values[i])
+            return
+
+        execute(self)
+        self._last_inputs_key = key
+        if key is not None:
+            # Outputs that are one of the inputs, as (output key, input index)
+            passed_through = tuple(
+                (output_key, i)
+                for output_key in self._outputs._keys
+                for i, value in enumerate(values)
+                if getattr(self, output_key) is value
+            )
+            self._last_outputs = (self._outputs.snapshot(), passed_through)
+
+    return wrapper
+
+
+# ------------------------------------------------------------------
+# Dictionary view over component attributes
+# ------------------------------------------------------------------
+class _SlotView(MutableMapping[str, Any]):
+    """
+    Dictionary-style view mapping a fixed set of keys onto attributes of a
+    component, so `component.inputs["input_text"]` reads `component.input_text`.
+    """
+
+    __slots__ = ("_component", "_keys", "_read")
+
+    def __init__(self, component: "BaseComponent", keys: List[str]) -> None:
+        self._component = component
+        self._keys = tuple(keys)
+        self._read: Callable[[Any], Any] = (
+            attrgetter(*self._keys) if self._keys else lambda component: ()
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self._component, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._keys:
+            raise KeyError(key)
+        setattr(self._component, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Component properties cannot be removed.")
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def snapshot(self) -> Any:
+        """
+        Returns the values of all keys read in one C-level call: the value
+        itself when the view has a single key, else a tuple in key order.
+        """
+        return self._read(self._component)
+
+    def restore(self, snapshot: Any) -> None:
+        """
+        Writes back the values returned by snapshot().
+        """
+        if len(self._keys) == 1:
+            setattr(self._component, self._keys[0], snapshot)
+        else:
+            for key, value in zip(self._keys, snapshot):
+                setattr(self._component, key, value)
 
 
 # ------------------------------------------------------------------
 # Component base class
 # ------------------------------------------------------------------
+class _Unimplemented(Enum):
+    """
+    Type of the _UNIMPLEMENTED sentinel.
+    """
+
+    UNIMPLEMENTED = "unimplemented"
+
+
+# Returned by BaseComponent.execute() and execute_batch() in place of raising,
+# so that the pipeline can skip components that do not implement execute();
+# a NotImplementedError raised by a subclass is still reported the same way
+_UNIMPLEMENTED: Final = _Unimplemented.UNIMPLEMENTED
+
+
+def _check_keys(
+    component_type: type, input_keys: List[str], output_keys: List[str]
+) -> None:
+    """
+    Raises a ValueError unless every key names a distinct attribute that can
+    hold a value without replacing anything else of the component: an
+    identifier (not a keyword or "__" name) used once across the inputs and
+    outputs, and either no class attribute or a slot declared by a subclass.
+    """
+    seen: Set[str] = set()
+    for key in (*input_keys, *output_keys):
+        if not key.isidentifier() or iskeyword(key) or key.startswith("__"):
+            raise ValueError(
+                f"Invalid component: Key {key!r} is not a valid attribute name."
+            )
+        if key in seen:
+            raise ValueError(f"Invalid component: Key {key!r} is used more than once.")
+        seen.add(key)
+        attribute = getattr(component_type, key, None)
+        if attribute is not None and not (
+            isinstance(attribute, MemberDescriptorType)
+            and attribute.__objclass__ is not BaseComponent
+        ):
+            raise ValueError(
+                f"Invalid component: Key {key!r} collides with a class attribute."
+            )
+
+
 class BaseComponent:
     """
     BaseComponent class for defining components with dynamic input and output dictionaries.
+    Each input and output key is stored as an attribute of the same name (declare
+    them in the subclass's __slots__ for fixed-offset access); `inputs` and
+    `outputs` expose them as dictionaries. execute() must write its results
+    into those attributes in place: the dictionaries cannot be rebound, since
+    the pipeline keeps references to them between runs. The pipeline only
+    executes a component once all of its inputs hold a value (see
+    inputs_ready()), so execute() need not check them for None.
     """
 
+    __slots__ = ("name", "_inputs", "_outputs", "_last_inputs_key", "_last_outputs")
+
+    def __init_subclass__(cls, abstract: bool = False, **kwargs: Any) -> None:
+        """
+        Sets up a subclass. Classes declared with `abstract=True` are bases
+        for other components and are not warned about leaving execute()
+        unimplemented.
+        """
+        super().__init_subclass__(**kwargs)
+        if not abstract and cls.execute is BaseComponent.execute:
+            logger.warning("%s does not override the `execute` method.", cls.__name__)
+
     def __init__(
         self, name: str, input_keys: List[str], output_keys: List[str]
     ) -> None:
+        _check_keys(type(self), input_keys, output_keys)
         self.name = name
-        self.inputs: Dict[str, Any] = {key: None for key in input_keys}
-        self.outputs: Dict[str, Any] = {key: None for key in output_keys}
+        # Interned keys let dictionary and attribute lookups match by identity
+        input_keys = [sys.intern(key) for key in input_keys]
+        output_keys = [sys.intern(key) for key in output_keys]
+        for key in (*input_keys, *output_keys):
+            setattr(self, key, None)
+        self._inputs = _SlotView(self, input_keys)
+        self._outputs = _SlotView(self, output_keys)
+        # Input key and outputs of the last execution, used by @memoize
+        self._last_inputs_key: Any = None
+        self._last_outputs: Any = None
 
-    def execute(self) -> None:
+    @property
+    def inputs(self) -> MutableMapping[str, Any]:
+        return self._inputs
+
+    @property
+    def outputs(self) -> MutableMapping[str, Any]:
+        return self._outputs
+
+    def inputs_ready(self) -> bool:
         """
-        Logs the execution of the component and raises a NotImplementedError.
-        Subclasses should override this method.
+        Returns whether every input holds a value, i.e. is not None. Override
+        this to let a component execute with some of its inputs missing.
         """
-        logging.info(f"Executing component: {self.name}")
-        raise NotImplementedError(
-            "The `execute` method is not implemented in this component. Please override this method in your subclass."
-        )
+        return all(getattr(self, key) is not None for key in self._inputs._keys)
+
+    def execute(self) -> Optional[_Unimplemented]:
+        """
+        Logs the execution of the component and returns _UNIMPLEMENTED, which
+        the pipeline reports as an execution error. Subclasses should override
+        this method.
+        """
+        logger.info("Executing component: %s", self.name)
+        return _UNIMPLEMENTED
+
+    def execute_batch(
+        self, inputs: Dict[str, List[Any]], size: int
+    ) -> Union[Dict[str, List[Any]], _Unimplemented]:
+        """
+        Executes the component on a batch of `size` rows given as one list per
+        input key, and returns one list per output key. This default runs
+        execute() once per row, producing None outputs for rows whose inputs are
+        not ready, and then restores the inputs, outputs and memoized state the
+        component had before, which the result of the last run() refers to;
+        subclasses override it with a vectorized version.
+        """
+        inputs_state = self._inputs.snapshot()
+        outputs_state = self._outputs.snapshot()
+        memo_state = (self._last_inputs_key, self._last_outputs)
+        outputs: Dict[str, List[Any]] = {key: [] for key in self.outputs}
+        try:
+            for i in range(size):
+                for key, column in inputs.items():
+                    setattr(self, key, column[i])
+                ready = self.inputs_ready()
+                if ready and self.execute() is _UNIMPLEMENTED:
+                    return _UNIMPLEMENTED
+                for key, column in outputs.items():
+                    column.append(getattr(self, key) if ready else None)
+        finally:
+            self._inputs.restore(inputs_state)
+            self._outputs.restore(outputs_state)
+            self._last_inputs_key, self._last_outputs = memo_state
+        return outputs
 
 
 # ------------------------------------------------------------------
 # Pipeline class
 # ------------------------------------------------------------------
+# A component, its input readiness test, its bound execute method and its
+# outgoing edges, each bound as a (getter, setter) pair
+PlanStep = Tuple[
+    BaseComponent,
+    Callable[[], bool],
+    Callable[[], Optional[_Unimplemented]],
+    List[Tuple[Callable[[BaseComponent], Any], Callable[[Any], None]]],
+]
+
+
+def _check_connection(
+    output_component: BaseComponent,
+    output_property: str,
+    input_component: BaseComponent,
+    input_property: str,
+) -> None:
+    """
+    Raises a ValueError unless the output and input properties exist.
+    """
+    # Check if the specified keys exist in the components' input and output dictionaries
+    if (
+        output_property not in output_component.outputs
+        or input_property not in input_component.inputs
+    ):
+        raise ValueError("Invalid connection: Output or input property does not exist.")
+
+
+def _ready_source(name: str, component: BaseComponent) -> str:
+    """
+    Returns the source expression testing the inputs of the component held by
+    variable `name` for readiness: the component's own inputs_ready() if it
+    overrides it, else an `is not None` test per input attribute.
+    """
+    if type(component).inputs_ready is not BaseComponent.inputs_ready:
+        return f"{name}.inputs_ready()"
+    # Keys are checked to be plain identifiers when components are built
+    tests = [f"{name}.{key} is not None" for key in component._inputs._keys]
+    return " and ".join(tests) or "True"
+
+
+def _bind_ready(component: BaseComponent) -> Callable[[], bool]:
+    """
+    Returns the readiness test of the component's inputs as a function, with
+    the per-key tests of _ready_source() unrolled instead of looped over.
+    """
+    if type(component).inputs_ready is not BaseComponent.inputs_ready:
+        return component.inputs_ready
+    ready: Callable[[], bool] = eval(
+        "lambda: " + _ready_source("component", component), {"component": component}
+    )
+    return ready
+
+
 class Pipeline:
-    def __init__(self):
+    def __init__(
+        self, max_workers: Optional[int] = None, debug: bool = False
+    ) -> None:
+        """
+        With `max_workers` set, run() executes components concurrently on a
+        thread pool of that size, starting each one as soon as all of its
+        producers have finished; close() the pipeline, or use it as a context
+        manager, to shut the pool down. With `debug` set,
+        run() walks the plan step by step and re-checks every connection
+        before transferring data along it.
+        """
+        self.max_workers = max_workers
+        self.debug = debug
+        self._executor: Optional[ThreadPoolExecutor] = None
         self.components: List[BaseComponent] = []
-        self.connections: Dict[
-            Tuple[BaseComponent, str], Tuple[BaseComponent, str]
-        ] = {}
+        self._by_name: Dict[str, BaseComponent] = {}
+        # Component receiving the initial input, the first one unless set_entry()
+        self._entry: Optional[BaseComponent] = None
+        # Every connection as (output_component, output_key, input_component,
+        # input_key); run() only uses the per-producer edges below
+        self.connections: List[Tuple[BaseComponent, str, BaseComponent, str]] = []
+        # Outgoing edges per producer: (output_key, input_component, input_key).
+        # The graph bookkeeping is keyed by id() so that components never have
+        # their __hash__/__eq__ invoked (or need to define them).
+        self._out_edges: Dict[int, List[Tuple[str, BaseComponent, str]]] = {}
+        # Execution plan built by finalize(): (component, [(getter, setter), ...])
+        self._plan: Optional[List[PlanStep]] = None
+        # Setters of the entry component's inputs, bound by finalize()
+        self._entry_setters: Dict[str, Callable[[Any], None]] = {}
+        # Number of incoming edges per component id, counted by finalize()
+        self._in_degree: Dict[int, int] = {}
+        # Result returned by every run, mapping names to the live outputs
+        self._result: Dict[str, Any] = {}
+        # Plans pruned by _prune(), keyed by the wanted components' ids
+        self._pruned: Dict[FrozenSet[int], List[PlanStep]] = {}
+        # Straight-line function generated from the plan by compile()
+        self._compiled: Optional[Callable[[], None]] = None
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts down the thread pool used with `max_workers`, waiting for its
+        threads to exit. A later concurrent run starts a new pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def add_component(self, component: BaseComponent) -> None:
+        if component.name in self._by_name:
+            raise ValueError(
+                f"Invalid component: Name {component.name!r} is already in use."
+            )
+        # Interned so that the result dictionary is keyed by interned names
+        component.name = sys.intern(component.name)
         self.components.append(component)
+        self._by_name[component.name] = component
+        self._plan = None
+        self._compiled = None
+
+    def get_component(self, name: str) -> BaseComponent:
+        """
+        Returns the component with the given name, raising a KeyError if the
+        pipeline has none.
+        """
+        return self._by_name[name]
+
+    def set_entry(self, component: BaseComponent) -> None:
+        """
+        Makes the component the one that receives the initial input of run().
+        """
+        if self._by_name.get(component.name) is not component:
+            raise ValueError("Invalid entry: Component is not part of the pipeline.")
+        self._entry = component
+        self._plan = None
+
+    def _finalized_plan(self) -> List[PlanStep]:
+        """
+        Returns the execution plan, finalizing the pipeline first if needed.
+        """
+        if self._plan is None:
+            self.finalize()
+        plan = self._plan
+        assert plan is not None  # Set by finalize()
+        return plan
+
+    def _entry_component(self) -> BaseComponent:
+        """
+        Returns the component set by set_entry(), or else the first one.
+        """
+        return self._entry if self._entry is not None else self.components[0]
 
     def connect(
         self,
@@ -50,145 +498,529 @@ class Pipeline:
         input_component: BaseComponent,
         input_property: str,
     ) -> None:
-        # Check if the specified keys exist in the components' input and output dictionaries
-        if (
-            output_property not in output_component.outputs
-            or input_property not in input_component.inputs
-        ):
-            raise ValueError(
-                "Invalid connection: Output or input property does not exist."
-            )
+        """
+        Connects an output property of one component to an input property of
+        another. Property names are interned here; callers building edges from
+        dynamically created strings should intern them too (`sys.intern`) so
+        lookups against the component keys stay identity comparisons.
+        """
+        output_property = sys.intern(output_property)
+        input_property = sys.intern(input_property)
+        _check_connection(
+            output_component, output_property, input_component, input_property
+        )
         # Store the connection using component instances and property names
-        self.connections[(output_component, output_property)] = (
-            input_component,
-            input_property,
+        self.connections.append(
+            (output_component, output_property, input_component, input_property)
+        )
+        self._out_edges.setdefault(id(output_component), []).append(
+            (output_property, input_component, input_property)
+        )
+        self._plan = None
+        self._compiled = None
+
+    def finalize(self) -> None:
+        """
+        Topologically sorts the components (Kahn's algorithm, ties broken by
+        insertion order) and stores the resulting execution plan so that run()
+        can execute the graph without re-interpreting it on every call.
+        Raises a ValueError if the pipeline has no components, a connection is
+        invalid or the connections contain a cycle.
+        """
+        if not self.components:
+            raise ValueError("Invalid pipeline: No components in the pipeline.")
+
+        in_degree = {id(component): 0 for component in self.components}
+        for component in self.components:
+            for output_key, input_component, input_key in self._out_edges.get(
+                id(component), ()
+            ):
+                _check_connection(component, output_key, input_component, input_key)
+                if id(input_component) in in_degree:
+                    in_degree[id(input_component)] += 1
+
+        self._in_degree = dict(in_degree)
+
+        ready = deque(c for c in self.components if in_degree[id(c)] == 0)
+        plan: List[PlanStep] = []
+        while ready:
+            component = ready.popleft()
+            edges = self._out_edges.get(id(component), [])
+            # Bind each edge to C-level accessors: setter(getter(component))
+            plan.append(
+                (
+                    component,
+                    _bind_ready(component),
+                    component.execute,
+                    [
+                        (attrgetter(output_key), partial(setattr, ic, input_key))
+                        for output_key, ic, input_key in edges
+                    ],
+                )
+            )
+            for _, input_component, _ in edges:
+                input_id = id(input_component)
+                if input_id in in_degree:
+                    in_degree[input_id] -= 1
+                    if in_degree[input_id] == 0:
+                        ready.append(input_component)
+
+        if len(plan) != len(self.components):
+            raise ValueError("Invalid pipeline: Connections contain a cycle.")
+        self._plan = plan
+        self._pruned = {}
+        entry = self._entry_component()
+        self._entry_setters = {
+            key: partial(setattr, entry, key) for key in entry.inputs
+        }
+        self._result = {c.name: c.outputs for c in self.components}
+
+    def compile(self) -> "FrozenPipeline":
+        """
+        Generates a straight-line function that executes the finalized plan
+        (`c0.execute()`, `c1.input_text = c0.processed_text`, `c1.execute()`, ...)
+        with no loops or dictionary lookups. run() calls it instead of walking
+        the plan until components or connections change. Returns the pipeline
+        frozen around that function, callable as a drop-in replacement for run().
+        """
+        plan = self._finalized_plan()
+
+        namespace: Dict[str, Any] = {
+            "_UNIMPLEMENTED": _UNIMPLEMENTED,
+            "_log_unimplemented": _log_unimplemented,
+        }
+        names: Dict[int, str] = {}
+
+        def name_of(component: BaseComponent) -> str:
+            if id(component) not in names:
+                names[id(component)] = f"c{len(names)}"
+                namespace[names[id(component)]] = component
+            return names[id(component)]
+
+        lines = ["def _run():"]
+        for component, _, _, _ in plan:
+            src = name_of(component)
+            lines += [
+                f"    if {_ready_source(src, component)}:",
+                "        try:",
+                f"            result = {src}.execute()",
+                "        except NotImplementedError as e:",
+                f"            _log_unimplemented({src}, e)",
+                "        else:",
+                "            if result is _UNIMPLEMENTED:",
+                f"                _log_unimplemented({src})",
+            ]
+            edges = self._out_edges.get(id(component), ())
+            if edges:
+                lines.append("            else:")
+            # Keys are checked to be plain identifiers when components are built
+            for output_key, input_component, input_key in edges:
+                dst = name_of(input_component)
+                lines.append(f"                {dst}.{input_key} = {src}.{output_key}")
+        lines.append("    return None")
+
+        exec("\n".join(lines), namespace)
+        self._compiled = namespace["_run"]
+        return FrozenPipeline(
+            components=tuple(self.components),
+            entry=self._entry_component(),
+            plan=tuple((c, r, e, tuple(edges)) for c, r, e, edges in plan),
+            execute=self._compiled,
+            result=self._result,
         )
 
-    def run(self, initial_input: Dict[str, Any]) -> Dict[str, Any]:
+    def run(
+        self,
+        initial_input: Dict[str, Any],
+        want: Optional[List[BaseComponent]] = None,
+        copy: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Runs the pipeline on the initial input. When `want` lists the
+        components whose outputs the caller will read, only those components
+        and the components they (transitively) depend on are executed.
+        The returned dictionary and the outputs in it are reused and updated by
+        later runs, unless `copy` is set to return a snapshot of them instead.
+        """
         if not self.components:
-            logging.error("No components in the pipeline.")
+            logger.error("No components in the pipeline.")
             return {}
 
-        # Check if initial input keys match the first component's input keys
-        if set(initial_input.keys()) != set(self.components[0].inputs.keys()):
-            logging.warning(
-                "Initial input keys do not match the first component's input keys."
+        plan = self._finalized_plan()
+        entry_setters = self._entry_setters
+
+        # Check if initial input keys match the entry component's input keys
+        if initial_input.keys() != entry_setters.keys():
+            logger.warning(
+                "Initial input keys do not match the entry component's input keys."
             )
 
-        # Initialize the first component's input
-        self.components[0].inputs.update(initial_input)
+        # Initialize the entry component's input
+        for key, value in initial_input.items():
+            setter = entry_setters.get(key)
+            if setter is not None:
+                setter(value)
 
-        for component in self.components:
+        if want is not None:
+            plan = self._prune(want)
+
+        if self.debug:
+            self._run_checked(plan)
+        elif self.max_workers is not None:
+            self._run_concurrent(plan)
+        elif want is None and self._compiled is not None:
+            self._compiled()
+        else:
+            _run_plan(plan)
+
+        # Assuming the last component's output is the final output
+        if copy:
+            return {name: dict(outputs) for name, outputs in self._result.items()}
+        return self._result
+
+    def run_batch(
+        self, initial_inputs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Runs the pipeline on a batch of initial inputs, executing each
+        component once for the whole batch through execute_batch(), and returns
+        one result per initial input in the format of run().
+        """
+        if not self.components:
+            logger.error("No components in the pipeline.")
+            return []
+
+        plan = self._finalized_plan()
+
+        # Thread one list per input key through the plan
+        size = len(initial_inputs)
+        columns = {
+            id(component): {key: [None] * size for key in component.inputs}
+            for component in self.components
+        }
+        entry_columns = columns[id(self._entry_component())]
+        for i, initial_input in enumerate(initial_inputs):
+            for key, value in initial_input.items():
+                if key in entry_columns:
+                    entry_columns[key][i] = value
+
+        results: Dict[int, Dict[str, List[Any]]] = {}
+        for component, _, _, _ in plan:
+            error: Optional[NotImplementedError] = None
             try:
-                component.execute()
+                outputs = component.execute_batch(columns[id(component)], size)
             except NotImplementedError as e:
-                logging.error(f"Execution error in component {component.name}: {e}")
+                error = e
+                outputs = _UNIMPLEMENTED
+            if outputs is _UNIMPLEMENTED:
+                _log_unimplemented(component, error)
+                outputs = {key: [None] * size for key in component.outputs}
+                results[id(component)] = outputs
                 continue
 
-            # Transfer outputs to connected inputs
-            for (output_component, output_key), (
-                input_component,
-                input_key,
-            ) in self.connections.items():
-                if component == output_component and output_key in component.outputs:
-                    input_component.inputs[input_key] = component.outputs[output_key]
+            results[id(component)] = outputs
+            for output_key, input_component, input_key in self._out_edges.get(
+                id(component), ()
+            ):
+                if id(input_component) in columns:
+                    columns[id(input_component)][input_key] = outputs[output_key]
 
-        # Assuming the last component's output is the final output
-        return {component.name: component.outputs for component in self.components}
+        return [
+            {
+                component.name: {
+                    key: column[i] for key, column in results[id(component)].items()
+                }
+                for component in self.components
+            }
+            for i in range(size)
+        ]
+
+    def _prune(self, want: List[BaseComponent]) -> List[PlanStep]:
+        """
+        Returns the plan restricted to the wanted components and their
+        transitive predecessors, computed once per set of wanted components.
+        """
+        key = frozenset(map(id, want))
+        if key not in self._pruned:
+            predecessors: Dict[int, List[BaseComponent]] = {}
+            for component in self.components:
+                for _, input_component, _ in self._out_edges.get(id(component), ()):
+                    predecessors.setdefault(id(input_component), []).append(component)
+
+            live: Set[int] = set()
+            pending = list(want)
+            while pending:
+                component = pending.pop()
+                if id(component) not in live:
+                    live.add(id(component))
+                    pending.extend(predecessors.get(id(component), ()))
+
+            plan = self._finalized_plan()
+            self._pruned[key] = [step for step in plan if id(step[0]) in live]
+        return self._pruned[key]
+
+    def _run_checked(self, plan: List[PlanStep]) -> None:
+        """
+        Executes the plan step by step, re-checking each connection before
+        transferring data along it.
+        """
+        for component, _, _, _ in plan:
+            if not _execute_component(component):
+                continue
+            outputs = component.outputs
+            for output_key, input_component, input_key in self._out_edges.get(
+                id(component), ()
+            ):
+                _check_connection(component, output_key, input_component, input_key)
+                input_component.inputs[input_key] = outputs[output_key]
+
+    def _run_concurrent(self, plan: List[PlanStep]) -> None:
+        """
+        Executes the plan on the thread pool, submitting each component as soon
+        as all of its producers have finished. Outputs are propagated on the
+        calling thread, before any consumer of them is submitted, so component
+        inputs are never written while the component runs.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        steps = {id(step[0]): step for step in plan}
+        # Pruned plans only drop components without live consumers, so every
+        # producer counted here is part of the plan and will finish
+        pending_inputs = {key: self._in_degree[key] for key in steps}
+        ready = deque(step for step in plan if pending_inputs[id(step[0])] == 0)
+        in_flight: Dict[Future[bool], PlanStep] = {}
+        try:
+            while ready or in_flight:
+                while ready:
+                    step = ready.popleft()
+                    future = self._executor.submit(_execute_component, step[0])
+                    in_flight[future] = step
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    component, _, _, edges = in_flight.pop(future)
+                    if future.result():
+                        for getter, setter in edges:
+                            setter(getter(component))
+                    for _, input_component, _ in self._out_edges.get(
+                        id(component), ()
+                    ):
+                        input_id = id(input_component)
+                        if input_id in pending_inputs:
+                            pending_inputs[input_id] -= 1
+                            if pending_inputs[input_id] == 0:
+                                ready.append(steps[input_id])
+        except BaseException:
+            # Components still running must not write into their outputs while
+            # the caller handles the error or starts the next run
+            for future in in_flight:
+                future.cancel()
+            wait(in_flight)
+            raise
+
+
+def _run_plan(plan: List[PlanStep]) -> None:
+    """
+    Executes the steps of a plan in order, skipping components whose inputs
+    are not ready and transferring each executed component's outputs to the
+    connected inputs (validated in finalize). Kept free of Pipeline state so
+    that it can be swapped for a compiled implementation of the same loop.
+    """
+    for component, ready, execute, edges in plan:
+        if not ready():
+            continue
+        try:
+            result = execute()
+        except NotImplementedError as e:
+            _log_unimplemented(component, e)
+            continue
+        if result is _UNIMPLEMENTED:
+            _log_unimplemented(component)
+            continue
+
+        for getter, setter in edges:
+            setter(getter(component))
+
+
+def _execute_component(component: BaseComponent) -> bool:
+    """
+    Executes a component if its inputs are ready, returning whether it did
+    (after logging the error if it does not implement execute()).
+    """
+    if not component.inputs_ready():
+        return False
+    try:
+        result = component.execute()
+    except NotImplementedError as e:
+        _log_unimplemented(component, e)
+        return False
+    if result is _UNIMPLEMENTED:
+        _log_unimplemented(component)
+        return False
+    return True
+
+
+def _log_unimplemented(
+    component: BaseComponent, error: Optional[NotImplementedError] = None
+) -> None:
+    """
+    Logs the execution error of a component that does not implement execute(),
+    either returning _UNIMPLEMENTED or raising the given NotImplementedError.
+    """
+    if error is None:
+        error = NotImplementedError(
+            "The `execute` method is not implemented in this component. "
+            "Please override this method in your subclass."
+        )
+    logger.error("Execution error in component %s: %s", component.name, error)
+
+
+# ------------------------------------------------------------------
+# Frozen pipeline
+# ------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class FrozenPipeline:
+    """
+    Immutable snapshot of a compiled pipeline, holding its components and plan
+    in tuples. Calling it runs the generated straight-line function and
+    returns the outputs like Pipeline.run().
+    """
+
+    components: Tuple[BaseComponent, ...]
+    entry: BaseComponent
+    plan: Tuple[
+        Tuple[
+            BaseComponent,
+            Callable[[], bool],
+            Callable[[], Optional[_Unimplemented]],
+            Tuple[Tuple[Callable[[BaseComponent], Any], Callable[[Any], None]], ...],
+        ],
+        ...,
+    ]
+    execute: Callable[[], None]
+    result: Dict[str, Any]
+
+    def __call__(self, initial_input: Dict[str, Any]) -> Dict[str, Any]:
+        entry_inputs = self.entry.inputs
+        for key, value in initial_input.items():
+            if key in entry_inputs:
+                entry_inputs[key] = value
+        self.execute()
+        return self.result
 
 
 # ------------------------------------------------------------------
 # Sample text preprocessor component
 # ------------------------------------------------------------------
 class TextPreprocessor(BaseComponent):
-    def __init__(self):
+    __slots__ = ("input_text", "processed_text")
+
+    # Slot types as seen by execute(), which only runs once the inputs are set
+    input_text: str
+    processed_text: str
+
+    def __init__(self) -> None:
         super().__init__(
             "Text Preprocessor",
             input_keys=["input_text"],
             output_keys=["processed_text"],
         )
 
-    @property
-    def input_text(self):
-        return self.inputs["input_text"]
-
-    @property
-    def processed_text(self):
-        return self.outputs["processed_text"]
+    @memoize
+    def execute(self) -> None:
+        # Convert to lowercase and remove extra spaces
+        self.processed_text = normalize_text(self.input_text)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s output: %s", self.name, self.outputs)
 
-    def execute(self):
-        if self.inputs["input_text"] is not None:
-            # Convert to lowercase and remove extra spaces
-            processed_text = " ".join(self.inputs["input_text"].lower().split())
-            self.outputs["processed_text"] = processed_text
-            logging.info(f"{self.name} output: {self.outputs}")
+    def execute_batch(
+        self, inputs: Dict[str, List[Any]], size: int
+    ) -> Dict[str, List[Any]]:
+        # Rows without input text produce None
+        return {"processed_text": normalize_texts(inputs["input_text"])}
 
 
 # ------------------------------------------------------------------
 # Sample text length caluculator component
 # ------------------------------------------------------------------
 class TextLengthCalculator(BaseComponent):
-    def __init__(self):
+    __slots__ = ("input_text", "text_length")
+
+    # Slot types as seen by execute(), which only runs once the inputs are set
+    input_text: str
+    text_length: int
+
+    def __init__(self) -> None:
         super().__init__(
             "Text Length Calculator",
             input_keys=["input_text"],  # Keep this as is for flexibility
             output_keys=["text_length"],
         )
 
-    @property
-    def input_text(self):
-        return self.inputs["input_text"]
-
-    @property
-    def text_length(self):
-        return self.outputs["text_length"]
+    @memoize
+    def execute(self) -> None:
+        self.text_length = len(self.input_text)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s output: %s", self.name, self.outputs)
 
-    def execute(self):
-        if self.input_text is not None:
-            text_length = len(self.input_text)
-            self.outputs["text_length"] = text_length
-            logging.info(f"{self.name} output: {self.outputs}")
+    def execute_batch(
+        self, inputs: Dict[str, List[Any]], size: int
+    ) -> Dict[str, List[Any]]:
+        # Rows without input text produce None
+        return {
+            "text_length": [
+                None if text is None else len(text) for text in inputs["input_text"]
+            ]
+        }
 
 
 # ------------------------------------------------------------------
 # Sample string int comparator component
 # ------------------------------------------------------------------
 class StringIntComparator(BaseComponent):
-    def __init__(self):
+    __slots__ = ("input_string", "input_int", "output_string", "output_int")
+
+    # Slot types as seen by execute(), which only runs once the inputs are set
+    input_string: str
+    input_int: int
+    output_string: Optional[str]
+    output_int: Optional[int]
+
+    def __init__(self) -> None:
         super().__init__(
             "String Int Comparator",
             input_keys=["input_string", "input_int"],
             output_keys=["output_string", "output_int"],
         )
 
-    @property
-    def input_string(self):
-        return self.inputs["input_string"]
-
-    @property
-    def input_int(self):
-        return self.inputs["input_int"]
-
-    @property
-    def output_string(self):
-        return self.outputs["output_string"]
+    @memoize
+    def execute(self) -> None:
+        if len(self.input_string) > self.input_int:
+            self.output_string = self.input_string
+            self.output_int = self.input_int
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%s output: %s", self.name, self.outputs)
+        else:
+            self.output_string = None
+            self.output_int = None
+            logger.info(
+                "%s output: output: Condition not met, outputs set to None",
+                self.name,
+            )
 
-    @property
-    def output_int(self):
-        return self.outputs["output_int"]
-
-    def execute(self):
-        if self.input_string is not None and self.input_int is not None:
-            if len(self.input_string) > self.input_int:
-                self.outputs["output_string"] = self.input_string
-                self.outputs["output_int"] = self.input_int
-                logging.info(f"{self.name} output: {self.outputs}")
-            else:
-                self.outputs["output_string"] = None
-                self.outputs["output_int"] = None
-                logging.info(
-                    f"{self.name} output: output: Condition not met, outputs set to None"
-                )
+    def execute_batch(
+        self, inputs: Dict[str, List[Any]], size: int
+    ) -> Dict[str, List[Any]]:
+        # Rows missing either input, or failing the condition, produce None
+        output_string: List[Any] = [None] * size
+        output_int: List[Any] = [None] * size
+        for i, (string, limit) in enumerate(
+            zip(inputs["input_string"], inputs["input_int"])
+        ):
+            if string is not None and limit is not None and len(string) > limit:
+                output_string[i] = string
+                output_int[i] = limit
+        return {"output_string": output_string, "output_int": output_int}
 
 
 # ------------------------------------------------------------------
@@ -0,0 +1,171 @@
+"""
+Text kernels used by the pipeline components, compiled with Numba when available
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, fall back to the str methods
+    np = None  # type: ignore[assignment]
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, fall back to the str methods
+    njit = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# Inputs up to this many characters are normalized faster by the str methods
+# than by the compiled kernel, whose packing and decoding cost about 10 µs per
+# call. Timing _normalize_ascii([text]) against " ".join(text.lower().split())
+# on random ASCII text (letters and whitespace) put the break-even between
+# 2500 and 4000 characters.
+JIT_THRESHOLD = 3500
+
+# Texts shorter than this many characters have their normalized form cached by
+# normalize_text(); longer texts rarely repeat and would pin too much memory
+CACHE_THRESHOLD = 1024
+
+
+# ------------------------------------------------------------------
+# Kernels
+# ------------------------------------------------------------------
+# These are compiled by Numba below and ahead of time by build_kernels.py,
+# so they must stay within Numba's nopython subset.
+if np is not None:
+    # Per-byte lane constants for the SWAR lowercase: adding 0x3F sets a
+    # lane's high bit from "A" upwards, adding 0x25 from "Z" + 1 upwards
+    _SWAR_FROM_A = np.uint64(0x3F3F3F3F3F3F3F3F)
+    _SWAR_PAST_Z = np.uint64(0x2525252525252525)
+    _SWAR_HIGH_BITS = np.uint64(0x8080808080808080)
+    _SWAR_SHIFT = np.uint64(2)
+
+
+def lower_ascii_swar(words: "NDArray[np.uint64]") -> None:
+    # Lowercases ASCII text packed into uint64 words in place, 8 bytes per
+    # step without branches: the high bit of each uppercase lane is isolated
+    # and shifted down to 0x20, which is OR'ed in. The loop has no branches or
+    # dependencies between words, so LLVM vectorizes it further (4 words, i.e.
+    # 32 bytes, per step with AVX2).
+    for i in range(words.size):
+        v = words[i]
+        upper = ((v + _SWAR_FROM_A) ^ (v + _SWAR_PAST_Z)) & _SWAR_HIGH_BITS
+        words[i] = v | (upper >> _SWAR_SHIFT)
+
+
+def collapse_whitespace(
+    buf: "NDArray[np.uint8]", offsets: "NDArray[np.int64]"
+) -> "Tuple[NDArray[np.uint8], NDArray[np.int64]]":
+    # Single pass over ASCII bytes holding one or more texts, text j spanning
+    # buf[offsets[j]:offsets[j + 1]]: collapse whitespace runs (the bytes
+    # str.split() treats as whitespace) into one space and drop leading and
+    # trailing whitespace. Each result is written at the start of its text's
+    # span in the output, and the result lengths are returned alongside.
+    out = np.empty(buf.size, dtype=np.uint8)
+    lengths = np.empty(offsets.size - 1, dtype=np.int64)
+    for j in range(offsets.size - 1):
+        start = offsets[j]
+        n = start
+        pending_space = False
+        for i in range(start, offsets[j + 1]):
+            c = buf[i]
+            if c == 0x20 or 0x09 <= c <= 0x0D or 0x1C <= c <= 0x1F:
+                if n > start:
+                    pending_space = True
+            else:
+                if pending_space:
+                    out[n] = 0x20
+                    n += 1
+                    pending_space = False
+                out[n] = c
+                n += 1
+        lengths[j] = n - start
+    return out, lengths
+
+
+# Prefer the ahead-of-time compiled kernels, which need no JIT warmup
+try:
+    # Built by build_kernels.py, so it may be missing when type checking
+    from pipeline_kernels import (  # type: ignore[import-not-found, unused-ignore]
+        collapse_whitespace as _collapse,
+        lower_ascii_swar as _lower,
+    )
+except ImportError:
+    if njit is not None:
+        _collapse = njit(cache=True, nogil=True)(collapse_whitespace)
+        _lower = njit(cache=True, nogil=True)(lower_ascii_swar)
+    else:
+        _collapse = _lower = None
+
+
+def _normalize_ascii(texts: List[str]) -> List[str]:
+    """
+    Normalizes ASCII texts with the compiled kernels, packed into one buffer.
+    """
+    data = "".join(texts).encode("ascii")
+    n = len(data)
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in texts], out=offsets[1:])
+    # Zero-pad into whole uint64 words for the SWAR lowercase
+    words = np.zeros((n + 7) // 8, dtype=np.uint64)
+    buf = words.view(np.uint8)
+    buf[:n] = np.frombuffer(data, dtype=np.uint8)
+    _lower(words)
+    out, lengths = _collapse(buf[:n], offsets)
+    result = out.tobytes()
+    return [
+        result[start : start + length].decode("ascii")
+        for start, length in zip(offsets.tolist(), lengths.tolist())
+    ]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercases the text and collapses runs of whitespace into single spaces,
+    equivalent to `" ".join(text.lower().split())`. Results for short texts
+    are kept in an LRU cache, so repeated inputs are looked up instead.
+    """
+    if len(text) < CACHE_THRESHOLD:
+        return _normalize_cached(text)
+    return _normalize(text)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_cached(text: str) -> str:
+    return _normalize(text)
+
+
+def _normalize(text: str) -> str:
+    if _collapse is not None and len(text) > JIT_THRESHOLD and text.isascii():
+        return _normalize_ascii([text])[0]
+    return " ".join(text.lower().split())
+
+
+def normalize_texts(texts: List[Optional[str]]) -> List[Optional[str]]:
+    """
+    Applies normalize_text() to every text of a batch (None entries stay None),
+    running the ASCII texts longer than JIT_THRESHOLD through the compiled
+    kernels in a single call.
+    """
+    results: List[Optional[str]] = [None] * len(texts)
+    # (index, text) of the texts for the compiled kernels
+    packed: List[Tuple[int, str]] = []
+    for i, text in enumerate(texts):
+        if text is None:
+            continue
+        # The kernels' cost is mostly per text, so short texts are not packed
+        # even when the batch as a whole is long
+        if _collapse is not None and len(text) > JIT_THRESHOLD and text.isascii():
+            packed.append((i, text))
+        else:
+            results[i] = " ".join(text.lower().split())
+
+    if packed:
+        normalized = _normalize_ascii([text for _, text in packed])
+        for (i, _), text in zip(packed, normalized):
+            results[i] = text
+    return results
+
@@ -7,17 +7,24 @@ Introduction to classes and object-oriented programming in python
 # define a class
 # ------------------------------------------------------------------
 class Car:
+    # Fixed set of instance attributes, so instances need no __dict__
+    __slots__ = ("make", "model", "year")
+
     # Class attribute to keep track of total cars produced
-    total_cars_produced = 0
+    _total_cars_produced = 0
 
     # Constructor method to initialize the object
     def __init__(self, make, model, year):
         self.make = make  # Instance variable for the car's make
         self.model = model  # Instance variable for the car's model
         self.year = year  # Instance variable for the car's year
-        Car.total_cars_produced += (
-            1  #  Increment total cars produced each time  a new car is created
-        )
+        # Increment total cars produced each time a new car is created
+        Car._total_cars_produced += 1
+
+    # Class method to get the total number of cars produced
+    @classmethod
+    def total_cars_produced(cls):
+        return cls._total_cars_produced
 
     # Method to display car details
     def display_details(self):
@@ -48,6 +55,6 @@ my_car.make
 my_car.display_details()
 
 # ------------------------------------------------------------------
-# Access the class attribute for total number of cars produced
+# Call the class method for total number of cars produced
 # ------------------------------------------------------------------
-print(f"Total cars produced: {Car.total_cars_produced}")
+print(f"Total cars produced: {Car.total_cars_produced()}")